@@ -11,16 +11,62 @@ This script:
 """
 
 import os
+import re
 import sys
 import json
+import time
+import random
+import email.utils
 import urllib.request
 import urllib.error
+from email.message import Message
+from typing import IO, Any, Iterator, Mapping, Union
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
 GITHUB_REPOSITORY = os.environ.get("GITHUB_REPOSITORY", "")
+MAX_ATTEMPTS = 3
+MAX_RETRY_WAIT_SECONDS = 300
+SECONDARY_RATE_LIMIT_WAIT_SECONDS = 60
+PLAN_READ_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+# A complete string, a bracket, or a lone quote for a string cut off by the chunk.
+_SKIP_TOKEN_RE = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]|"', re.S)
+_JSON_DECODER = json.JSONDecoder()
+
+
+def parse_retry_after(headers: Union[Message, Mapping[str, str]]) -> float:
+    """Return the seconds GitHub asked us to wait, or 0.0 if it did not say."""
+    retry_after = (headers.get("Retry-After") or "").strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    if retry_after:
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None:
+            return max(0.0, retry_at.timestamp() - time.time())
+
+    # X-RateLimit-Reset is sent on every response; it only applies once the
+    # primary quota is exhausted.
+    reset = (headers.get("X-RateLimit-Reset") or "").strip()
+    if headers.get("X-RateLimit-Remaining") == "0" and reset.isdigit():
+        return max(0.0, int(reset) - time.time())
+    return 0.0
+
+
+def is_rate_limited(error: urllib.error.HTTPError) -> bool:
+    """Detect primary (403 + exhausted quota) and secondary (429) rate limits."""
+    headers = error.headers or {}
+    if error.code == 429:
+        return True
+    return error.code == 403 and (
+        headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers
+    )
 
 
 def post_github_issue(title: str, body: str) -> None:
@@ -44,61 +90,208 @@ def post_github_issue(title: str, body: str) -> None:
         method="POST",
     )
 
-    try:
-        with urllib.request.urlopen(req) as resp:
-            if resp.status in (200, 201):
-                print("✅ Drift issue created successfully.")
-            else:
-                print(f"⚠️ Unexpected response: {resp.status}")
-    except urllib.error.HTTPError as e:
-        print(f"Error creating issue: {e.code} {e.reason}", file=sys.stderr)
-        sys.exit(1)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        try:
+            with urllib.request.urlopen(req) as resp:
+                if resp.status in (200, 201):
+                    print("✅ Drift issue created successfully.")
+                else:
+                    print(f"⚠️ Unexpected response: {resp.status}")
+            return
+        except urllib.error.HTTPError as e:
+            if is_rate_limited(e):
+                delay = parse_retry_after(e.headers or {})
+                if not delay:
+                    # No hint: GitHub asks for at least a minute, then backoff.
+                    base = SECONDARY_RATE_LIMIT_WAIT_SECONDS * 2 ** (attempt - 1)
+                    delay = min(
+                        MAX_RETRY_WAIT_SECONDS, base + random.uniform(0, base / 10)
+                    )
+                if attempt == MAX_ATTEMPTS:
+                    print(
+                        f"Rate limited by GitHub ({e.code}); giving up after "
+                        f"{MAX_ATTEMPTS} attempts.",
+                        file=sys.stderr,
+                    )
+                elif delay > MAX_RETRY_WAIT_SECONDS:
+                    print(
+                        f"Rate limited by GitHub ({e.code}); not waiting the "
+                        f"requested {delay:.0f}s (limit {MAX_RETRY_WAIT_SECONDS}s).",
+                        file=sys.stderr,
+                    )
+                else:
+                    print(
+                        f"Rate limited by GitHub ({e.code}); retrying in {delay:.0f}s.",
+                        file=sys.stderr,
+                    )
+                    time.sleep(delay)
+                    continue
+            print(f"Error creating issue: {e.code} {e.reason}", file=sys.stderr)
+            sys.exit(1)
+
+
+class _PlanReader:
+    """Chunked cursor over a JSON document that decodes only what it is asked for."""
+
+    def __init__(self, f: IO[str]) -> None:
+        self._file = f
+        self._buf = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping consumed text. False at end of file."""
+        # Grow the read with the pending text so large values stay linear.
+        chunk = self._file.read(max(PLAN_READ_CHUNK_SIZE, len(self._buf) - self._pos))
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, or "" at end of file."""
+        while True:
+            self._pos = _WHITESPACE_RE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if not found:
+            raise ValueError("plan file is truncated")
+        if found != char:
+            raise ValueError(f"malformed plan JSON: expected {char!r}, found {found!r}")
+        self._pos += 1
+
+    def decode(self) -> Any:
+        """Decode the next value, reading more chunks until it is complete."""
+        if not self.peek():
+            raise ValueError("plan file is truncated")
+        while True:
+            try:
+                value, end = _JSON_DECODER.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def skip_value(self) -> None:
+        """Move past the next value without building it."""
+        if self.peek() not in "{[":
+            self.decode()
+            return
+        depth = 0
+        while True:
+            match = _SKIP_TOKEN_RE.search(self._buf, self._pos)
+            if match is None or match.group() == '"':
+                # Nothing structural left, or a string split across chunks.
+                if match is not None:
+                    self._pos = match.start()
+                else:
+                    self._pos = len(self._buf)
+                if not self._fill():
+                    raise ValueError("plan file is truncated")
+                continue
+            self._pos = match.end()
+            token = match.group()
+            if token in "{[":
+                depth += 1
+            elif token in "}]":
+                depth -= 1
+                if depth == 0:
+                    return
+
+
+def iter_resource_changes(plan_file: str) -> Iterator[dict]:
+    """Yield the plan's top-level resource_changes one entry at a time.
+
+    Plans for a full EKS cluster can be hundreds of MB, so the file is read in
+    chunks. Other top-level values (planned_values, prior_state, ...) are
+    skipped without being decoded, and only the resource_changes entries are
+    built.
+    """
+    with open(plan_file, 'r', encoding="utf-8") as f:
+        reader = _PlanReader(f)
+        reader.expect("{")
+        if reader.peek() == "}":
+            return
+
+        while True:
+            key = reader.decode()
+            if not isinstance(key, str):
+                raise ValueError("malformed plan JSON: object key is not a string")
+            reader.expect(":")
+            if key == "resource_changes":
+                break
+            reader.skip_value()
+            if reader.peek() == "}":
+                return
+            reader.expect(",")
+
+        reader.expect("[")
+        if reader.peek() == "]":
+            return
+        while True:
+            yield reader.decode()
+            if reader.peek() == "]":
+                return
+            reader.expect(",")
 
 
 def parse_plan(plan_file: str) -> str:
     """Parse the JSON plan and return a markdown-formatted report."""
-    try:
-        with open(plan_file, 'r') as f:
-            data = json.load(f)
-    except Exception as e:
-        return f"Error reading plan file: {str(e)}"
-
-    resource_changes = data.get("resource_changes", [])
     drifted_resources = []
 
-    for change in resource_changes:
-        actions = change.get("change", {}).get("actions", [])
-        if "no-op" not in actions and actions:
-            drifted_resources.append({
-                "address": change["address"],
-                "actions": actions,
-                "type": change["type"]
-            })
+    try:
+        for change in iter_resource_changes(plan_file):
+            actions = change.get("change", {}).get("actions", [])
+            if "no-op" not in actions and actions:
+                drifted_resources.append({
+                    "address": change["address"],
+                    "actions": actions,
+                    "type": change["type"]
+                })
+    except (OSError, ValueError) as e:
+        return f"Error reading plan file: {str(e)}"
 
     if not drifted_resources:
         return ""
 
-    report = "## 🔍 Infrastructure Drift Detected\n\n"
-    report += (
+    lines = [
+        "## 🔍 Infrastructure Drift Detected",
+        "",
         "The automated drift detection scan has identified discrepancies between "
-        "the live AWS environment and the Terraform state.\n\n"
+        "the live AWS environment and the Terraform state.",
+        "",
+        "### Summary of Changes",
+        "",
+        "| Resource Address | Change Type | Resource Type |",
+        "|------------------|-------------|---------------|",
+    ]
+    lines.extend(
+        f"| `{dr['address']}` | `{', '.join(dr['actions']).upper()}` | `{dr['type']}` |"
+        for dr in drifted_resources
     )
-    report += "### Summary of Changes\n\n"
-    report += "| Resource Address | Change Type | Resource Type |\n"
-    report += "|------------------|-------------|---------------|\n"
-
-    for dr in drifted_resources:
-        action_str = ", ".join(dr["actions"]).upper()
-        report += f"| `{dr['address']}` | `{action_str}` | `{dr['type']}` |\n"
-
-    report += "\n---\n"
-    report += "### Next Steps\n"
-    report += "1. Review the changes above.\n"
-    report += "2. Run `terraform plan` locally to inspect the full diff.\n"
-    report += "3. Run `terraform apply` to reconcile the state, or update the code if the change was intentional.\n\n"
-    report += "*Automated report by Infrastructure Drift Detector.*"
-
-    return report
+    lines.extend([
+        "",
+        "---",
+        "### Next Steps",
+        "1. Review the changes above.",
+        "2. Run `terraform plan` locally to inspect the full diff.",
+        "3. Run `terraform apply` to reconcile the state, or update the code if the "
+        "change was intentional.",
+        "",
+        "*Automated report by Infrastructure Drift Detector.*",
+    ])
+
+    return "\n".join(lines)
 
 
 def main() -> None:
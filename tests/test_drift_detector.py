@@ -5,8 +5,12 @@ from __future__ import annotations
 import json
 import os
 import sys
+import urllib.error
+from email.message import Message
 from pathlib import Path
 
+import pytest
+
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
 
 import drift_detector
@@ -68,3 +72,249 @@ def test_parse_plan_handles_missing_file(tmp_path: Path) -> None:
     report = drift_detector.parse_plan(str(missing_path))
 
     assert report.startswith("Error reading plan file:")
+
+
+def test_iter_resource_changes_decodes_entries_across_chunks(
+    tmp_path: Path, monkeypatch
+) -> None:
+    changes = [
+        {
+            "address": f"aws_iam_role.role_{index}",
+            "type": "aws_iam_role",
+            "change": {"actions": ["update"], "after": {"name": "x" * 40}},
+        }
+        for index in range(5)
+    ]
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(
+        json.dumps(
+            {
+                "format_version": "1.2",
+                "planned_values": {"root_module": {"resources": changes}},
+                "resource_changes": changes,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(drift_detector, "PLAN_READ_CHUNK_SIZE", 16)
+
+    assert list(drift_detector.iter_resource_changes(str(plan_path))) == changes
+
+
+def test_iter_resource_changes_stops_at_end_of_array(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(
+        '{"resource_changes": [{"address": "a"}, {"address": "b"}], '
+        '"prior_state": <not decoded>',
+        encoding="utf-8",
+    )
+
+    changes = drift_detector.iter_resource_changes(str(plan_path))
+
+    assert [change["address"] for change in changes] == ["a", "b"]
+
+
+def test_iter_resource_changes_ignores_nested_resource_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text(
+        '{"variables": {"cfg": {"value": {"resource_changes": []}}}, '
+        '"planned_values": {"note": "\\"resource_changes\\": [{}]"}, '
+        '"resource_changes": [{"address": "aws_eks_cluster.main", '
+        '"type": "aws_eks_cluster", "change": {"actions": ["update"]}}]}',
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(drift_detector, "PLAN_READ_CHUNK_SIZE", 8)
+
+    report = drift_detector.parse_plan(str(plan_path))
+
+    assert "`aws_eks_cluster.main`" in report
+
+
+def test_parse_plan_reports_plan_truncated_before_resource_changes(
+    tmp_path: Path,
+) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text('{"format_version": "1.2", "planned_v', encoding="utf-8")
+
+    report = drift_detector.parse_plan(str(plan_path))
+
+    assert report.startswith("Error reading plan file:")
+
+
+def test_parse_plan_reports_truncated_plan(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text('{"resource_changes": [{"address": "a"', encoding="utf-8")
+
+    report = drift_detector.parse_plan(str(plan_path))
+
+    assert report.startswith("Error reading plan file:")
+
+
+def test_parse_plan_reports_non_json_plan(tmp_path: Path) -> None:
+    plan_path = tmp_path / "plan.json"
+    plan_path.write_text("Error: Terraform exited with code 1", encoding="utf-8")
+
+    report = drift_detector.parse_plan(str(plan_path))
+
+    assert report.startswith("Error reading plan file:")
+
+
+def test_parse_retry_after_accepts_seconds() -> None:
+    assert drift_detector.parse_retry_after({"Retry-After": "30"}) == 30.0
+
+
+def test_parse_retry_after_accepts_http_date(monkeypatch) -> None:
+    monkeypatch.setattr(drift_detector.time, "time", lambda: 1_767_225_600.0)
+
+    delay = drift_detector.parse_retry_after(
+        {"Retry-After": "Thu, 01 Jan 2026 00:00:45 GMT"}
+    )
+
+    assert delay == 45.0
+
+
+def test_parse_retry_after_falls_back_to_rate_limit_reset(monkeypatch) -> None:
+    monkeypatch.setattr(drift_detector.time, "time", lambda: 1_000.0)
+
+    exhausted = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1020"}
+
+    assert drift_detector.parse_retry_after(exhausted) == 20.0
+    assert drift_detector.parse_retry_after({}) == 0.0
+
+
+def test_parse_retry_after_ignores_reset_while_quota_remains(monkeypatch) -> None:
+    monkeypatch.setattr(drift_detector.time, "time", lambda: 1_000.0)
+
+    delay = drift_detector.parse_retry_after(
+        {"X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": "2800"}
+    )
+
+    assert delay == 0.0
+
+
+class FakeResponse:
+    status = 201
+
+    def __enter__(self) -> "FakeResponse":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+def rate_limit_error(code: int, headers: dict) -> urllib.error.HTTPError:
+    message = Message()
+    for name, value in headers.items():
+        message[name] = value
+    return urllib.error.HTTPError(
+        "https://api.github.com", code, "error", message, None
+    )
+
+
+def install_fake_urlopen(monkeypatch, responses: list) -> list:
+    """Serve responses in order from urlopen and return the recorded requests."""
+    calls: list = []
+
+    def fake_urlopen(req):
+        calls.append(req)
+        result = responses.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    monkeypatch.setattr(drift_detector.urllib.request, "urlopen", fake_urlopen)
+    return calls
+
+
+def test_post_github_issue_retries_after_rate_limit(monkeypatch) -> None:
+    responses = [rate_limit_error(429, {"Retry-After": "7"}), FakeResponse()]
+    sleeps: list = []
+
+    install_fake_urlopen(monkeypatch, responses)
+    monkeypatch.setattr(drift_detector.time, "sleep", sleeps.append)
+
+    drift_detector.post_github_issue("title", "body")
+
+    assert sleeps == [7.0]
+    assert responses == []
+
+
+def test_post_github_issue_exits_on_forbidden_without_rate_limit(
+    monkeypatch,
+) -> None:
+    install_fake_urlopen(monkeypatch, [rate_limit_error(403, {})])
+    monkeypatch.setattr(drift_detector.time, "sleep", pytest.fail)
+
+    with pytest.raises(SystemExit):
+        drift_detector.post_github_issue("title", "body")
+
+
+def test_post_github_issue_waits_for_primary_rate_limit_reset(monkeypatch) -> None:
+    exhausted = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "1020"}
+    responses = [rate_limit_error(403, exhausted), FakeResponse()]
+    sleeps: list = []
+
+    install_fake_urlopen(monkeypatch, responses)
+    monkeypatch.setattr(drift_detector.time, "time", lambda: 1_000.0)
+    monkeypatch.setattr(drift_detector.time, "sleep", sleeps.append)
+
+    drift_detector.post_github_issue("title", "body")
+
+    assert sleeps == [20.0]
+
+
+def test_post_github_issue_backs_off_from_a_minute_without_retry_hint(
+    monkeypatch,
+) -> None:
+    no_hint = {"X-RateLimit-Remaining": "4000"}
+    responses = [
+        rate_limit_error(429, no_hint),
+        rate_limit_error(429, no_hint),
+        FakeResponse(),
+    ]
+    bounds: list = []
+    sleeps: list = []
+
+    def fake_uniform(low: float, high: float) -> float:
+        bounds.append((low, high))
+        return 1.5
+
+    install_fake_urlopen(monkeypatch, responses)
+    monkeypatch.setattr(drift_detector.random, "uniform", fake_uniform)
+    monkeypatch.setattr(drift_detector.time, "sleep", sleeps.append)
+
+    drift_detector.post_github_issue("title", "body")
+
+    assert bounds == [(0, 6.0), (0, 12.0)]
+    assert sleeps == [61.5, 121.5]
+
+
+def test_post_github_issue_refuses_wait_over_limit(monkeypatch, capsys) -> None:
+    install_fake_urlopen(monkeypatch, [rate_limit_error(429, {"Retry-After": "3600"})])
+    monkeypatch.setattr(drift_detector.time, "sleep", pytest.fail)
+
+    with pytest.raises(SystemExit):
+        drift_detector.post_github_issue("title", "body")
+
+    assert "requested 3600s" in capsys.readouterr().err
+
+
+def test_post_github_issue_gives_up_after_max_attempts(monkeypatch, capsys) -> None:
+    responses = [
+        rate_limit_error(429, {"Retry-After": "1"})
+        for _ in range(drift_detector.MAX_ATTEMPTS)
+    ]
+    sleeps: list = []
+
+    calls = install_fake_urlopen(monkeypatch, responses)
+    monkeypatch.setattr(drift_detector.time, "sleep", sleeps.append)
+
+    with pytest.raises(SystemExit):
+        drift_detector.post_github_issue("title", "body")
+
+    assert len(calls) == drift_detector.MAX_ATTEMPTS
+    assert sleeps == [1.0] * (drift_detector.MAX_ATTEMPTS - 1)
+    assert "giving up" in capsys.readouterr().err